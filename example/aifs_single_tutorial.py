@@ -9,70 +9,207 @@ AIFS-Single is ECMWF's new AI-based weather forecasting model that provides
 high-resolution global weather predictions.
 """
 
+import argparse
 import asyncio
+import json
+import logging
+import os
 import sys
-from datetime import datetime, timedelta
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 # Add the parent directory to Python path to import main module
 sys.path.append(str(Path(__file__).parent.parent))
 
+from rich.logging import RichHandler
+from rich.table import Table
+
 from main import ECMWFDownloader, DownloadConfig, console
 
+# Progress chatter goes through logging so it is filtered before any Rich markup
+# is rendered; set ECMWF_LOG_LEVEL=DEBUG to see every probe
+logger = logging.getLogger(__name__)
+logger.addHandler(RichHandler(console=console, markup=True, show_time=False,
+                              show_level=False, show_path=False))
+logger.setLevel(os.environ.get("ECMWF_LOG_LEVEL", "INFO").upper())
+logger.propagate = False
 
-async def find_most_recent_aifs_data():
-    """Find the most recent available AIFS-Single data."""
-    config = DownloadConfig(
-        output_dir=Path("./tutorial_downloads/aifs_single"),
-        max_concurrent_downloads=3,
-        timeout_seconds=300
+# Directory listings only change when a new forecast run is published, so results
+# are reused for this long instead of hitting ECMWF again.
+LISTING_CACHE_TTL_SECONDS = 15 * 60
+
+# Maximum number of directory listings requested at the same time
+MAX_CONCURRENT_PROBES = 5
+
+# Maximum number of files downloaded at the same time
+# (override with --concurrency or ECMWF_MAX_CONCURRENT)
+DEFAULT_MAX_CONCURRENT = 8
+
+# Number of days searched for the most recent run
+# (override with --lookback-days or ECMWF_LOOKBACK_DAYS)
+DEFAULT_LOOKBACK_DAYS = 3
+
+# Runs are not published until a while after their nominal start time
+PUBLICATION_DELAY = timedelta(hours=2)
+
+# Non-empty listings are also persisted here (under the output directory) so
+# that re-running the tutorial within the TTL doesn't list published runs again
+LISTING_CACHE_FILENAME = ".listing_cache.json"
+
+# (date, forecast_time, model, resolution, data_type) -> (created_at, future)
+_listing_cache = {}
+_listing_cache_file_lock = asyncio.Lock()
+
+
+def _read_listing_cache(path: Path) -> dict:
+    """Read the on-disk listing cache, treating a missing or corrupt file as empty."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_listing_cache(path: Path, key: str, files: list):
+    """Add an entry to the on-disk listing cache, dropping expired entries."""
+    now = time.time()
+    cache = {
+        k: v for k, v in _read_listing_cache(path).items()
+        if now - v.get('ts', 0) < LISTING_CACHE_TTL_SECONDS
+    }
+    cache[key] = {'ts': now, 'files': files}
+    
+    # Write to a temporary file first so readers never see a partial cache
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(cache, f)
+    os.replace(tmp_path, path)
+
+
+async def _load_cached_listing(path: Path, key: str):
+    """Return the cached file list for key, or None if absent or expired."""
+    entry = (await asyncio.to_thread(_read_listing_cache, path)).get(key)
+    if entry is not None and time.time() - entry.get('ts', 0) < LISTING_CACHE_TTL_SECONDS:
+        return entry['files']
+    return None
+
+
+async def _fetch_listing(downloader, date: str, forecast_time: str, model: str,
+                         resolution: str, data_type: str):
+    """Fetch a directory listing, preferring a fresh copy from the on-disk cache."""
+    cache_path = downloader.config.output_dir / LISTING_CACHE_FILENAME
+    cache_key = f"{date}/{forecast_time}/{model}/{resolution}/{data_type}"
+    
+    files = await _load_cached_listing(cache_path, cache_key)
+    if files is not None:
+        return files
+    
+    files = await downloader.list_available_files(
+        date=date,
+        forecast_time=forecast_time,
+        model=model,
+        resolution=resolution,
+        data_type=data_type,
+        warn_missing=False  # callers report missing runs themselves
     )
     
-    async with ECMWFDownloader(config) as downloader:
-        console.print("[bold blue]🔍 Searching for most recent AIFS-Single data...[/bold blue]")
-        
-        # Check the last 5 days for available data
-        for days_back in range(5):
-            date = (datetime.now() - timedelta(days=days_back)).strftime("%Y%m%d")
-            console.print(f"[dim]Checking date: {date}[/dim]")
-            
-            # Try different forecast times (12z is typically available first)
-            for forecast_time in ["12z", "00z"]:
-                files = await downloader.list_available_files(
-                    date=date,
-                    forecast_time=forecast_time,
-                    model="aifs-single",  # This is the AI model
-                    resolution="0p25",    # 0.25 degree resolution (~25km)
-                    data_type="oper"      # Operational forecast
-                )
-                
-                if files:
-                    console.print(f"[green]✓ Found {len(files)} files for {date} {forecast_time}[/green]")
-                    return date, forecast_time, files
-                else:
-                    console.print(f"[dim]No files found for {date} {forecast_time}[/dim]")
-        
-        console.print("[red]❌ No recent AIFS-Single data found in the last 5 days[/red]")
-        return None, None, []
-
-
-async def download_specific_forecast_hours(date: str, forecast_time: str, files: list, 
-                                          forecast_hours: list = None):
+    # Only real listings are persisted: list_available_files returns an empty list
+    # (never a partial one) when the request fails, and a run that isn't
+    # published yet should be checked again next time
+    if files:
+        async with _listing_cache_file_lock:
+            await asyncio.to_thread(_write_listing_cache, cache_path, cache_key, files)
+    return files
+
+
+async def _cached_list(downloader, date: str, forecast_time: str, model: str = "aifs-single",
+                       resolution: str = "0p25", data_type: str = "oper"):
+    """List available files, reusing results fetched within the cache TTL."""
+    key = (date, forecast_time, model, resolution, data_type)
+    entry = _listing_cache.get(key)
+    if entry is not None and time.monotonic() - entry[0] < LISTING_CACHE_TTL_SECONDS:
+        return await entry[1]
+    
+    # Store the pending future so concurrent callers share a single request
+    future = asyncio.ensure_future(_fetch_listing(downloader, *key))
+    _listing_cache[key] = (time.monotonic(), future)
+    try:
+        return await future
+    except BaseException:
+        _listing_cache.pop(key, None)
+        raise
+
+
+def _candidate_runs(lookback_days: int = DEFAULT_LOOKBACK_DAYS):
+    """Return the (date, forecast_time) runs to check, most recent first."""
+    # ECMWF dates and run times are in UTC
+    now = datetime.now(timezone.utc)
+    candidates = []
+    
+    for days_back in range(lookback_days):
+        day = (now - timedelta(days=days_back)).replace(hour=0, minute=0, second=0, microsecond=0)
+        # 12z is typically available first
+        for forecast_time in ["12z", "00z"]:
+            # Skip today's runs that cannot have been published yet
+            run_start = day + timedelta(hours=int(forecast_time[:-1]))
+            if run_start + PUBLICATION_DELAY > now:
+                continue
+            candidates.append((day.strftime("%Y%m%d"), forecast_time))
+    
+    return candidates
+
+
+async def _probe_runs(downloader: ECMWFDownloader, candidates: list, verbose: bool = True):
+    """List every candidate run concurrently, bounded so we don't hammer ECMWF."""
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_PROBES)
+    
+    async def probe(date, forecast_time):
+        async with semaphore:
+            if verbose:
+                logger.debug("[dim]Checking: %s %s[/dim]", date, forecast_time)
+            return await _cached_list(
+                downloader,
+                date=date,
+                forecast_time=forecast_time,
+                model="aifs-single",  # This is the AI model
+                resolution="0p25",    # 0.25 degree resolution (~25km)
+                data_type="oper"      # Operational forecast
+            )
+    
+    return await asyncio.gather(*[probe(date, forecast_time) for date, forecast_time in candidates],
+                                return_exceptions=True)
+
+
+async def find_most_recent_aifs_data(downloader: ECMWFDownloader, lookback_days: int = DEFAULT_LOOKBACK_DAYS):
+    """Find the most recent available AIFS-Single data."""
+    console.print("[bold blue]🔍 Searching for most recent AIFS-Single data...[/bold blue]")
+    
+    candidates = _candidate_runs(lookback_days)
+    results = await _probe_runs(downloader, candidates)
+    
+    for (date, forecast_time), files in zip(candidates, results):
+        if isinstance(files, list) and files:
+            logger.info("[green]✓ Found %d files for %s %s[/green]", len(files), date, forecast_time)
+            return date, forecast_time, files
+        else:
+            logger.debug("[dim]No files found for %s %s[/dim]", date, forecast_time)
+    
+    console.print(f"[red]❌ No recent AIFS-Single data found in the last {lookback_days} days[/red]")
+    return None, None, []
+
+
+async def download_specific_forecast_hours(downloader: ECMWFDownloader, date: str, forecast_time: str,
+                                          files: list, forecast_hours: list = None):
     """Download files for specific forecast hours."""
     if forecast_hours is None:
         forecast_hours = ["0", "6", "12", "24", "48"]  # Common forecast hours
     
-    config = DownloadConfig(
-        output_dir=Path("./tutorial_downloads/aifs_single"),
-        max_concurrent_downloads=3,
-        timeout_seconds=300
-    )
-    
     # Filter files by forecast hours
-    selected_files = []
-    for file_info in files:
-        if file_info['forecast_hour'] in forecast_hours:
-            selected_files.append(file_info)
+    wanted_hours = set(forecast_hours)
+    selected_files = [f for f in files if f['forecast_hour'] in wanted_hours]
     
     if not selected_files:
         console.print(f"[yellow]No files found for forecast hours: {forecast_hours}[/yellow]")
@@ -80,68 +217,45 @@ async def download_specific_forecast_hours(date: str, forecast_time: str, files:
     
     console.print(f"[blue]📥 Downloading {len(selected_files)} files for forecast hours: {', '.join(forecast_hours)}[/blue]")
     
-    async with ECMWFDownloader(config) as downloader:
-        results = await downloader.download_files(selected_files)
-        
-        if results['success'] > 0:
-            console.print(f"[green]✅ Successfully downloaded {results['success']} files[/green]")
-            console.print(f"[dim]Files saved to: {config.output_dir / date}[/dim]")
-        
-        if results['failed'] > 0:
-            console.print(f"[red]❌ Failed to download {results['failed']} files[/red]")
+    results = await downloader.download_files(selected_files)
+    
+    if results['success'] > 0:
+        console.print(f"[green]✅ Successfully downloaded {results['success']} files[/green]")
+        logger.info("[dim]Files saved to: %s[/dim]", downloader.config.output_dir / date)
+    
+    if results['failed'] > 0:
+        console.print(f"[red]❌ Failed to download {results['failed']} files[/red]")
 
 
-async def download_latest_surface_analysis():
+async def download_latest_surface_analysis(downloader: ECMWFDownloader, date: str, forecast_time: str, files: list):
     """Download the latest surface analysis (0-hour forecast) from AIFS-Single."""
     console.print("[bold green]🌍 Downloading Latest AIFS-Single Surface Analysis[/bold green]")
     
-    date, forecast_time, files = await find_most_recent_aifs_data()
-    
-    if not files:
-        return
-    
-    # Filter for 0-hour forecast (current analysis)
-    surface_files = [f for f in files if f['forecast_hour'] == '0']
-    
-    if surface_files:
-        console.print(f"[blue]Found {len(surface_files)} surface analysis files[/blue]")
-        await download_specific_forecast_hours(date, forecast_time, surface_files, ["0"])
-    else:
-        console.print("[yellow]No surface analysis files (0-hour forecast) found[/yellow]")
+    # The 0-hour forecast is the current analysis
+    await download_specific_forecast_hours(downloader, date, forecast_time, files, ["0"])
 
 
-async def download_short_range_forecast():
+async def download_short_range_forecast(downloader: ECMWFDownloader, date: str, forecast_time: str, files: list):
     """Download short-range forecast (0-48 hours) from AIFS-Single."""
     console.print("[bold green]🌤️  Downloading AIFS-Single Short-Range Forecast[/bold green]")
     
-    date, forecast_time, files = await find_most_recent_aifs_data()
-    
-    if not files:
-        return
-    
     # Download forecasts for 0, 6, 12, 24, and 48 hours
     forecast_hours = ["0", "6", "12", "24", "48"]
-    await download_specific_forecast_hours(date, forecast_time, files, forecast_hours)
+    await download_specific_forecast_hours(downloader, date, forecast_time, files, forecast_hours)
 
 
-async def show_available_files_info():
+async def show_available_files_info(date: str, forecast_time: str, files: list):
     """Display information about available AIFS-Single files."""
     console.print("[bold blue]📊 AIFS-Single File Information[/bold blue]")
     
-    date, forecast_time, files = await find_most_recent_aifs_data()
-    
-    if not files:
-        return
-    
-    # Group files by forecast hour
-    forecast_hours = {}
+    # Aggregate [file count, total size] per forecast hour in a single pass
+    forecast_hours = defaultdict(lambda: [0, 0])
     total_size = 0
     
     for file_info in files:
-        hour = file_info['forecast_hour']
-        if hour not in forecast_hours:
-            forecast_hours[hour] = []
-        forecast_hours[hour].append(file_info)
+        stats = forecast_hours[file_info['forecast_hour']]
+        stats[0] += 1
+        stats[1] += file_info['raw_size']
         total_size += file_info['raw_size']
     
     console.print(f"\n[green]📅 Date: {date} {forecast_time}[/green]")
@@ -150,23 +264,77 @@ async def show_available_files_info():
     console.print(f"[green]📦 Total files: {len(files)}[/green]")
     console.print(f"[green]💾 Total size: {_format_file_size(total_size)}[/green]")
     
-    console.print("\n[bold]Available forecast hours:[/bold]")
-    for hour in sorted(forecast_hours.keys(), key=lambda x: int(x) if x.isdigit() else 999):
-        file_count = len(forecast_hours[hour])
-        hour_size = sum(f['raw_size'] for f in forecast_hours[hour])
-        console.print(f"  {hour}h: {file_count} files ({_format_file_size(hour_size)})")
+    table = Table(title="Available forecast hours")
+    table.add_column("Hour", style="cyan")
+    table.add_column("Files", justify="right")
+    table.add_column("Size", justify="right", style="red")
+    
+    # Numeric hours in order, then anything unparseable (e.g. "unknown") by name
+    for hour in sorted(forecast_hours, key=lambda x: (0, int(x)) if x.isdigit() else (1, x)):
+        file_count, hour_size = forecast_hours[hour]
+        table.add_row(f"{hour}h", str(file_count), _format_file_size(hour_size))
+    
+    console.print()
+    console.print(table)
+
+
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
 
 
 def _format_file_size(size_bytes: int) -> str:
     """Format file size in human readable format."""
-    for unit in ['B', 'KB', 'MB', 'GB']:
-        if size_bytes < 1024:
-            return f"{size_bytes:.1f} {unit}"
-        size_bytes /= 1024
-    return f"{size_bytes:.1f} TB"
+    # Each unit is a factor of 2**10, so the unit index follows from the bit length
+    idx = min((max(size_bytes, 1).bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (idx * 10)):.1f} {_SIZE_UNITS[idx]}"
+
+
+async def _ainput(prompt: str) -> str:
+    """Read a line from stdin without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    
+    def resolve(result, error):
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+    
+    def read():
+        try:
+            loop.call_soon_threadsafe(resolve, input(prompt), None)
+        except Exception as e:
+            loop.call_soon_threadsafe(resolve, None, e)
+    
+    # A daemon thread (rather than the default executor) so that an interrupted
+    # prompt doesn't keep the interpreter waiting for the blocked read at exit
+    threading.Thread(target=read, daemon=True).start()
+    return await future
+
+
+def _positive_int(value: str) -> int:
+    """argparse type for options that must be a whole number of at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a positive integer, got {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"expected a positive integer, got {number}")
+    return number
 
 
-async def main():
+def _make_config(max_concurrent_downloads: int = DEFAULT_MAX_CONCURRENT) -> DownloadConfig:
+    """Build the download configuration used by every tutorial step."""
+    return DownloadConfig(
+        output_dir=Path("./tutorial_downloads/aifs_single"),
+        max_concurrent_downloads=max_concurrent_downloads,
+        timeout_seconds=300
+    )
+
+
+async def main(max_concurrent_downloads: int = DEFAULT_MAX_CONCURRENT,
+               lookback_days: int = DEFAULT_LOOKBACK_DAYS):
     """Main tutorial function."""
     console.print("[bold magenta]🚀 AIFS-Single Download Tutorial[/bold magenta]")
     console.print("[dim]AIFS-Single is ECMWF's AI-based global weather forecasting model[/dim]\n")
@@ -178,22 +346,36 @@ async def main():
     console.print("3. Download short-range forecast (0-48 hours)")
     console.print("4. Run all examples")
     
+    config = _make_config(max_concurrent_downloads)
+    
     try:
-        choice = input("\nEnter your choice (1-4): ").strip()
-        
-        if choice == "1":
-            await show_available_files_info()
-        elif choice == "2":
-            await download_latest_surface_analysis()
-        elif choice == "3":
-            await download_short_range_forecast()
-        elif choice == "4":
-            await show_available_files_info()
-            await download_latest_surface_analysis()
-            await download_short_range_forecast()
-        else:
-            console.print("[red]Invalid choice. Please run the script again.[/red]")
-            return
+        # One downloader (and HTTP connection pool) is shared by every step
+        async with ECMWFDownloader(config) as downloader:
+            # Every option needs the most recent run, so start listing candidate
+            # runs while the user reads the menu; the results land in the cache
+            prefetch = asyncio.create_task(_probe_runs(downloader, _candidate_runs(lookback_days), verbose=False))
+            
+            choice = (await _ainput("\nEnter your choice (1-4): ")).strip()
+            
+            if choice not in ("1", "2", "3", "4"):
+                prefetch.cancel()
+                console.print("[red]Invalid choice. Please run the script again.[/red]")
+                return
+            
+            date, forecast_time, files = await find_most_recent_aifs_data(downloader, lookback_days)
+            if not files:
+                return
+            
+            if choice == "1":
+                await show_available_files_info(date, forecast_time, files)
+            elif choice == "2":
+                await download_latest_surface_analysis(downloader, date, forecast_time, files)
+            elif choice == "3":
+                await download_short_range_forecast(downloader, date, forecast_time, files)
+            elif choice == "4":
+                await show_available_files_info(date, forecast_time, files)
+                await download_latest_surface_analysis(downloader, date, forecast_time, files)
+                await download_short_range_forecast(downloader, date, forecast_time, files)
             
     except KeyboardInterrupt:
         console.print("\n[yellow]Tutorial interrupted by user[/yellow]")
@@ -202,5 +384,23 @@ async def main():
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="AIFS-Single download tutorial")
+    # String defaults go through type= as well, so a bad environment value is
+    # reported as a usage error rather than a traceback
+    parser.add_argument(
+        "--concurrency", type=_positive_int,
+        default=os.environ.get("ECMWF_MAX_CONCURRENT", str(DEFAULT_MAX_CONCURRENT)),
+        help="Max concurrent downloads (default: %(default)s, env: ECMWF_MAX_CONCURRENT)"
+    )
+    parser.add_argument(
+        "--lookback-days", type=_positive_int,
+        default=os.environ.get("ECMWF_LOOKBACK_DAYS", str(DEFAULT_LOOKBACK_DAYS)),
+        help="Days to search for the most recent run (default: %(default)s, env: ECMWF_LOOKBACK_DAYS)"
+    )
+    args = parser.parse_args()
+    
     # Run the tutorial
-    asyncio.run(main()) 
\ No newline at end of file
+    try:
+        asyncio.run(main(args.concurrency, args.lookback_days))
+    except KeyboardInterrupt:
+        console.print("\n[yellow]Tutorial interrupted by user[/yellow]") 
\ No newline at end of file
@@ -6,21 +6,38 @@ A CLI tool for downloading meteorological forecast data from ECMWF Data Store.
 Supports various forecast models and data formats.
 """
 
+from __future__ import annotations
+
 import asyncio
+import base64
+import codecs
+import hashlib
+import json
+import os
+import random
 import re
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Optional, Dict, Any, Union
-from urllib.parse import urljoin, urlparse
+from typing import TYPE_CHECKING, AsyncIterator, Callable, List, Optional, Dict, Any, Tuple
 
 import aiohttp
-import httpx
-import pandas as pd
 import typer
 from pydantic import BaseModel, field_validator
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
-from rich.table import Table
+
+if TYPE_CHECKING:
+    # Only needed by some commands, so imported where they are used
+    from rich.progress import Progress
+
+try:
+    import orjson
+except ImportError:  # optional, the standard json module is used instead
+    orjson = None
+
+try:
+    import uvloop
+except ImportError:  # optional, the default asyncio event loop is used instead
+    uvloop = None
 
 app = typer.Typer(
     name="ecmwf-downloader",
@@ -33,6 +50,35 @@ console = Console()
 ECMWF_BASE_URL = "https://data.ecmwf.int/forecasts/"
 DEFAULT_OUTPUT_DIR = Path("./ecmwf_data")
 VALID_DATE_FORMAT = "%Y%m%d"
+# HTTP statuses worth retrying (rate limiting and transient server errors)
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRY_DELAY_SECONDS = 20
+# Files smaller than this are not worth splitting into parallel range requests
+MIN_RANGED_DOWNLOAD_SIZE = 8 * 1024 * 1024
+# Chunks that may be waiting to be written to disk, per download stream
+WRITE_QUEUE_CHUNKS = 8
+# Directory listings fetched at the same time by bulk downloads
+MAX_CONCURRENT_LISTINGS = 10
+# Resolutions and data types probed for each model by list-config
+KNOWN_CONFIGURATIONS = {
+    'ifs': (['0p25', '0p4'], ['oper', 'enfo', 'waef', 'wave']),
+    'aifs-single': (['0p25'], ['oper']),
+}
+# Forecast times probed when the date listing doesn't name any
+DEFAULT_FORECAST_TIMES = ['12z', '18z']
+# Units for human readable file sizes, each 1024 times the previous one
+SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+# Directory listing patterns, compiled once at import
+# File entry: <a href="filename.ext">filename.ext</a>       date time    size    id
+FILE_ENTRY_RE = re.compile(
+    r'<a href="([^"]+\.(?:grib2?|index|nc))"[^>]*>([^<]+)</a>\s+(\d{2}-\d{2}-\d{4}\s+\d{2}:\d{2})\s+(\d+)\s+(\d+)',
+    re.IGNORECASE
+)
+# Forecast hour within a filename (e.g., "20250617120000-0h-oper-fc.grib2")
+FORECAST_HOUR_RE = re.compile(r'-(\d+)h-')
+# Forecast time directory (e.g., "12z/")
+FORECAST_TIME_RE = re.compile(r'<a href="([^"]+z)/"[^>]*>([^<]+z)/</a>', re.IGNORECASE)
 
 
 class DownloadConfig(BaseModel):
@@ -41,7 +87,15 @@ class DownloadConfig(BaseModel):
     output_dir: Path = DEFAULT_OUTPUT_DIR
     max_concurrent_downloads: int = 5
     timeout_seconds: int = 300
-    chunk_size: int = 8192
+    chunk_size: int = 256 * 1024
+    max_retries: int = 3
+    num_streams: int = 4
+    
+    @field_validator('base_url')
+    @classmethod
+    def validate_base_url(cls, v):
+        # URLs are built by appending paths, so the base must be a directory
+        return v if v.endswith('/') else v + '/'
     
     @field_validator('output_dir', mode='before')
     @classmethod
@@ -52,6 +106,83 @@ class DownloadConfig(BaseModel):
         return v
 
 
+class RangeRequestsUnsupportedError(Exception):
+    """Raised when the server answers a Range request with the whole file."""
+
+
+class IncompleteListingError(Exception):
+    """Raised when a directory listing fails after some entries were yielded."""
+
+
+def _part_paths(output_path: Path) -> Tuple[Path, Path]:
+    """Return the paths of a ranged download's .part file and its progress sidecar."""
+    return (output_path.with_name(output_path.name + '.part'),
+            output_path.with_name(output_path.name + '.part.json'))
+
+
+def _load_part_state(state_path: Path) -> Optional[Dict[str, Any]]:
+    """Read a .part.json sidecar, treating a missing or corrupt one as absent."""
+    try:
+        state = _load_json(state_path.read_bytes())
+    except (OSError, ValueError):
+        return None
+    return state if isinstance(state, dict) else None
+
+
+def _discard_part_files(output_path: Path):
+    """Remove what an earlier ranged download of output_path left behind."""
+    for path in _part_paths(output_path):
+        path.unlink(missing_ok=True)
+
+
+def _write_chunks(fd: int, chunks: List[bytes], offset: Optional[int] = None) -> int:
+    """Write chunks to fd in as few syscalls as possible, at offset if given.
+    
+    Uses writev/pwritev where available and retries short writes.
+    Returns the number of bytes written.
+    """
+    views = [memoryview(chunk) for chunk in chunks]
+    total = 0
+    while views:
+        if offset is None:
+            n = os.writev(fd, views) if hasattr(os, 'writev') else os.write(fd, views[0])
+        else:
+            n = os.pwritev(fd, views, offset) if hasattr(os, 'pwritev') else os.pwrite(fd, views[0], offset)
+            offset += n
+        total += n
+        # Drop the buffers that were fully written and trim the one that wasn't
+        while views and n >= len(views[0]):
+            n -= len(views.pop(0))
+        if n:
+            views[0] = views[0][n:]
+    return total
+
+
+def _content_md5(digest) -> str:
+    """Encode an MD5 digest the way a Content-MD5 header carries it."""
+    return base64.b64encode(digest.digest()).decode()
+
+
+def _file_content_md5(path: Path) -> str:
+    """Compute the Content-MD5 value of a file on disk."""
+    with open(path, 'rb') as f:
+        return _content_md5(hashlib.file_digest(f, lambda: hashlib.md5(usedforsecurity=False)))
+
+
+def _update_digest_from_file(digest, path: Path):
+    """Feed the contents of a file on disk into digest."""
+    with open(path, 'rb') as f:
+        while chunk := f.read(1024 * 1024):
+            digest.update(chunk)
+
+
+def _failure_reason(error: BaseException) -> Tuple[bool, str]:
+    """Return whether a failed request is worth retrying, and a short reason."""
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status in RETRYABLE_STATUSES, f"HTTP {error.status}"
+    return True, str(error) or type(error).__name__
+
+
 class ECMWFDownloader:
     """Main class for downloading ECMWF data."""
     
@@ -62,7 +193,20 @@ class ECMWFDownloader:
     async def __aenter__(self):
         """Async context manager entry."""
         timeout = aiohttp.ClientTimeout(total=self.config.timeout_seconds)
-        self.session = aiohttp.ClientSession(timeout=timeout)
+        # Keep connections alive between requests to avoid repeated TLS handshakes.
+        # Everything is fetched from one host, which must allow a connection for
+        # every range stream of every concurrent download.
+        connections_per_host = self.config.max_concurrent_downloads * max(self.config.num_streams, 1)
+        connector = aiohttp.TCPConnector(
+            limit=connections_per_host * 2,
+            limit_per_host=connections_per_host,
+            keepalive_timeout=75,
+            ttl_dns_cache=300,
+            enable_cleanup_closed=True
+        )
+        # Let the socket buffer hold a couple of chunks before reading is paused
+        self.session = aiohttp.ClientSession(timeout=timeout, connector=connector,
+                                             read_bufsize=self.config.chunk_size)
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -81,6 +225,16 @@ class ECMWFDownloader:
         
         return dates
     
+    def _retry_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Seconds to wait before retry number ``attempt`` (0-based).
+        
+        Honours a numeric ``Retry-After`` header, otherwise uses exponential
+        backoff with jitter.
+        """
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), MAX_RETRY_DELAY_SECONDS)
+        return min(2 ** attempt, MAX_RETRY_DELAY_SECONDS) + random.uniform(0, 1)
+    
     def validate_date_format(self, date_str: str) -> bool:
         """Validate date format (YYYYMMDD)."""
         try:
@@ -93,51 +247,120 @@ class ECMWFDownloader:
                                    forecast_time: str = "12z", 
                                    model: str = "ifs", 
                                    resolution: str = "0p25", 
-                                   data_type: str = "oper") -> List[Dict[str, Any]]:
-        """List available files for a given date and parameters."""
+                                   data_type: str = "oper",
+                                   warn_missing: bool = True) -> List[Dict[str, Any]]:
+        """List available files for a given date and parameters.
+        
+        Set ``warn_missing`` to False to skip the console notice when the
+        directory does not exist (e.g. when probing several candidate runs).
+        A listing that fails part way through gives an empty list rather than
+        a partial one.
+        """
+        try:
+            return [
+                file_info async for file_info in self.iter_available_files(
+                    date, forecast_time, model, resolution, data_type, warn_missing
+                )
+            ]
+        except IncompleteListingError:
+            return []
+    
+    async def iter_available_files(self, date: str, 
+                                   forecast_time: str = "12z", 
+                                   model: str = "ifs", 
+                                   resolution: str = "0p25", 
+                                   data_type: str = "oper",
+                                   warn_missing: bool = True) -> AsyncIterator[Dict[str, Any]]:
+        """Yield available files as the directory listing is received.
+        
+        Entries are parsed while the rest of the listing is still downloading,
+        so callers can start acting on the first files straight away. If the
+        listing then fails for good, IncompleteListingError is raised so the
+        entries already yielded are not mistaken for the whole directory.
+        """
         if not self.validate_date_format(date):
             raise ValueError(f"Invalid date format: {date}. Expected YYYYMMDD.")
         
         # Build the full URL path
-        url = urljoin(self.config.base_url, f"{date}/{forecast_time}/{model}/{resolution}/{data_type}/")
+        url = f"{self.config.base_url}{date}/{forecast_time}/{model}/{resolution}/{data_type}/"
         
-        try:
-            async with self.session.get(url) as response:
-                if response.status == 404:
-                    console.print(f"[yellow]No data available for: {date}/{forecast_time}/{model}/{resolution}/{data_type}[/yellow]")
-                    return []
+        yielded = 0
+        for attempt in range(self.config.max_retries + 1):
+            retry_after = None
+            seen = 0
+            try:
+                async with self.session.get(url) as response:
+                    if response.status == 404:
+                        if warn_missing:
+                            console.print(f"[yellow]No data available for: {date}/{forecast_time}/{model}/{resolution}/{data_type}[/yellow]")
+                        return
+                    
+                    retry_after = response.headers.get('Retry-After')
+                    response.raise_for_status()
+                    
+                    async for complete in self._iter_listing_parts(response):
+                        # Parse directory listing for actual files
+                        for file_info in self._parse_data_files(complete, date, forecast_time, model, resolution, data_type):
+                            seen += 1
+                            # Skip entries already yielded before a retry
+                            if seen > yielded:
+                                yielded += 1
+                                yield file_info
+                    return
+                    
+            except (aiohttp.ClientConnectionError, aiohttp.ClientResponseError,
+                    aiohttp.ClientPayloadError, asyncio.TimeoutError) as e:
+                # Rate limiting and transient failures (including a body cut short)
+                # shouldn't make a date look empty
+                retryable, reason = _failure_reason(e)
                 
-                response.raise_for_status()
-                content = await response.text()
+                if not retryable or attempt == self.config.max_retries:
+                    console.print(f"[red]Error accessing {url}: {reason}[/red]")
+                    if yielded:
+                        raise IncompleteListingError(url) from e
+                    return
                 
-                # Parse directory listing for actual files
-                files = self._parse_data_files(content, date, forecast_time, model, resolution, data_type)
-                return files
+                delay = self._retry_delay(attempt, retry_after)
+                console.print(f"[yellow]{reason} from {url}, retrying in {delay:.1f}s...[/yellow]")
+                await asyncio.sleep(delay)
                 
-        except aiohttp.ClientError as e:
-            console.print(f"[red]Error accessing {url}: {e}[/red]")
-            return []
+            except aiohttp.ClientError as e:
+                console.print(f"[red]Error accessing {url}: {e}[/red]")
+                if yielded:
+                    raise IncompleteListingError(url) from e
+                return
+    
+    async def _iter_listing_parts(self, response: aiohttp.ClientResponse) -> AsyncIterator[str]:
+        """Yield the listing body in pieces that only contain whole entries."""
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        buffer = ""
+        async for chunk in response.content.iter_chunked(self.config.chunk_size):
+            buffer += decoder.decode(chunk)
+            # Every entry before the last link start is complete
+            cut = buffer.rfind('<a ')
+            if cut > 0:
+                yield buffer[:cut]
+                buffer = buffer[cut:]
+        yield buffer + decoder.decode(b'', final=True)
     
     def _parse_data_files(self, html_content: str, date: str, forecast_time: str, 
                          model: str, resolution: str, data_type: str) -> List[Dict[str, Any]]:
         """Parse HTML directory listing to extract actual data files."""
         files = []
         
-        # Updated regex to match the actual ECMWF file structure
-        # Pattern: <a href="filename.ext">filename.ext</a>       date time    size    id
-        file_pattern = r'<a href="([^"]+\.(?:grib2?|index|nc))"[^>]*>([^<]+)</a>\s+(\d{2}-\d{2}-\d{4}\s+\d{2}:\d{2})\s+(\d+)\s+(\d+)'
-        matches = re.findall(file_pattern, html_content, re.IGNORECASE)
+        matches = FILE_ENTRY_RE.findall(html_content)
         
         base_url = f"{self.config.base_url}{date}/{forecast_time}/{model}/{resolution}/{data_type}/"
         
         for href, filename, date_time, size, file_id in matches:
             # Extract forecast hour from filename (e.g., "20250617120000-0h-oper-fc.grib2")
-            hour_match = re.search(r'-(\d+)h-', filename)
+            hour_match = FORECAST_HOUR_RE.search(filename)
             forecast_hour = hour_match.group(1) if hour_match else "unknown"
             
             file_info = {
                 'filename': filename.strip(),
-                'url': urljoin(base_url, href),
+                # Entries link to files in this same directory
+                'url': base_url + href.rpartition('/')[2],
                 'date': date,
                 'forecast_time': forecast_time,
                 'model': model,
@@ -155,11 +378,9 @@ class ECMWFDownloader:
     
     def _format_file_size(self, size_bytes: int) -> str:
         """Format file size in human readable format."""
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if size_bytes < 1024:
-                return f"{size_bytes:.1f} {unit}"
-            size_bytes /= 1024
-        return f"{size_bytes:.1f} TB"
+        # The unit index is the number of whole factors of 2**10 in the size
+        idx = min((max(size_bytes, 1).bit_length() - 1) // 10, len(SIZE_UNITS) - 1)
+        return f"{size_bytes / (1 << (idx * 10)):.1f} {SIZE_UNITS[idx]}"
     
     def _get_file_type(self, filename: str) -> str:
         """Determine file type based on extension."""
@@ -173,7 +394,16 @@ class ECMWFDownloader:
             return 'Unknown'
     
     async def download_file(self, file_info: Dict[str, Any], progress: Progress, task_id: Any) -> bool:
-        """Download a single file with progress tracking."""
+        """Download a single file, advancing task_id by the bytes it receives.
+        
+        Files are assembled in a ``.part`` file that only replaces the output
+        once complete, so an existing output of the listed size is taken as
+        already downloaded. Transient failures are retried, resuming from
+        the bytes already fetched; a partial file left by an earlier run is
+        resumed the same way, provided it is for the same version of the file.
+        When the server sends a Content-MD5 header for the whole file, the
+        download is checked against it and discarded on a mismatch.
+        """
         url = file_info['url']
         filename = file_info['filename']
         output_path = self.config.output_dir / file_info['date'] / filename
@@ -181,64 +411,363 @@ class ECMWFDownloader:
         # Create date-specific directory
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        try:
-            async with self.session.get(url) as response:
-                response.raise_for_status()
-                
-                total_size = int(response.headers.get('content-length', 0))
-                if total_size > 0:
-                    progress.update(task_id, total=total_size)
+        # The task may be shared with other files, so it is advanced by the change
+        # in this file's byte count (which drops again if a retry starts over)
+        reported = 0
+        
+        def report(completed: int):
+            nonlocal reported
+            progress.update(task_id, advance=completed - reported)
+            reported = completed
+        
+        expected_size = file_info.get('raw_size') or None
+        if output_path.exists() and output_path.stat().st_size == expected_size:
+            report(expected_size)
+            console.print(f"[green]✓[/green] Already downloaded: {filename}")
+            return True
+        
+        for attempt in range(self.config.max_retries + 1):
+            try:
+                # Large files are fetched as several concurrent byte ranges when the
+                # server supports it (os.pwrite is unavailable on Windows)
+                ranged = False
+                if (self.config.num_streams > 1 and hasattr(os, 'pwrite')
+                        and (expected_size or 0) >= MIN_RANGED_DOWNLOAD_SIZE):
+                    ranged = await self._download_ranges(url, output_path, report)
                 
-                with open(output_path, 'wb') as f:
-                    downloaded = 0
-                    async for chunk in response.content.iter_chunked(self.config.chunk_size):
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        if total_size > 0:
-                            progress.update(task_id, completed=downloaded)
+                if not ranged:
+                    await self._download_stream(url, output_path, report, expected_size)
                 
                 console.print(f"[green]✓[/green] Downloaded: {filename}")
                 return True
                 
-        except Exception as e:
-            console.print(f"[red]✗[/red] Failed to download {filename}: {e}")
-            if output_path.exists():
-                output_path.unlink()  # Remove partial file
-            return False
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                retryable, reason = _failure_reason(e)
+                
+                if not retryable or attempt == self.config.max_retries:
+                    error = reason
+                    break
+                
+                headers = getattr(e, 'headers', None) or {}
+                delay = self._retry_delay(attempt, headers.get('Retry-After'))
+                console.print(f"[yellow]{reason} while downloading {filename}, retrying in {delay:.1f}s...[/yellow]")
+                await asyncio.sleep(delay)
+                
+            except Exception as e:
+                error = e
+                break
+        
+        # Any partial file is kept so that the next attempt can resume it
+        console.print(f"[red]✗[/red] Failed to download {filename}: {error}")
+        return False
+    
+    async def _download_stream(self, url: str, output_path: Path, report: Callable[[int], None],
+                               expected_size: Optional[int] = None):
+        """Download url over a single connection, resuming an earlier attempt if possible.
+        
+        The body is written to the same ``.part`` file as ranged downloads, with
+        the file's size, version (ETag or Last-Modified) and checksum kept in
+        the ``.part.json`` sidecar. A partial file is only resumed when the
+        server confirms (via If-Range) that it still has that version.
+        report is called with the number of bytes of the file on disk so far.
+        """
+        part_path, state_path = _part_paths(output_path)
+        
+        # Anything other than an earlier single-stream attempt (such as a
+        # ranged one, or a partial file without a sidecar) is started over
+        state = _load_part_state(state_path) if part_path.exists() else None
+        if state is not None and 'ranges' in state:
+            state = None
+        downloaded = part_path.stat().st_size if state is not None else 0
+        
+        headers = {}
+        if downloaded:
+            headers['Range'] = f'bytes={downloaded}-'
+            if state.get('version'):
+                headers['If-Range'] = state['version']
+        
+        async with self.session.get(url, headers=headers) as response:
+            content_range = response.headers.get('content-range', '')
+            remote_size = content_range.rpartition('/')[2]
+            remote_size = int(remote_size) if remote_size.isdigit() else None
+            version = response.headers.get('etag') or response.headers.get('last-modified')
+            
+            if response.status == 416:
+                # The requested start is past the end: either the file is already
+                # complete, or the local copy doesn't match and must be restarted
+                if (state is None or remote_size != downloaded or state.get('size') not in (None, downloaded)
+                        or (version and state.get('version') and version != state['version'])):
+                    _discard_part_files(output_path)
+                    raise aiohttp.ClientPayloadError(f"Partial file {output_path.name} does not match the server copy")
+            else:
+                response.raise_for_status()
+            
+            if response.status == 206:
+                range_start = content_range.removeprefix('bytes ').partition('-')[0]
+                if (state is None or range_start != str(downloaded) or remote_size is None
+                        or remote_size != (state.get('size') or remote_size)
+                        or remote_size != (expected_size or remote_size)):
+                    _discard_part_files(output_path)
+                    raise aiohttp.ClientPayloadError(f"Unexpected Content-Range for {url}")
+            elif response.status != 416:
+                # The server sent the whole file, either because nothing was on disk
+                # or because the file changed since the partial copy was fetched
+                downloaded = 0
+                content_length = int(response.headers.get('content-length', 0)) or None
+                state = {
+                    'size': content_length,
+                    'version': version,
+                    'md5': response.headers.get('content-md5')
+                }
+            
+            report(downloaded)
+            
+            # The checksum covers the whole file, so a resumed download is hashed
+            # starting from the bytes already on disk
+            expected_md5 = state.get('md5')
+            digest = hashlib.md5(usedforsecurity=False) if expected_md5 else None
+            if digest is not None and downloaded:
+                await asyncio.to_thread(_update_digest_from_file, digest, part_path)
+            
+            if response.status != 416:
+                def on_written(size: int):
+                    nonlocal downloaded
+                    downloaded += size
+                    report(downloaded)
+                
+                def write(chunks: List[bytes]) -> int:
+                    if digest is not None:
+                        for chunk in chunks:
+                            digest.update(chunk)
+                    return _write_chunks(fd, chunks)
+                
+                state_path.write_bytes(_dump_json(state))
+                flags = os.O_WRONLY | os.O_CREAT | getattr(os, 'O_BINARY', 0)
+                flags |= os.O_APPEND if downloaded else os.O_TRUNC
+                fd = os.open(part_path, flags, 0o644)
+                try:
+                    await self._write_body(response, write, on_written)
+                finally:
+                    os.close(fd)
+        
+        if digest is not None and _content_md5(digest) != expected_md5.strip():
+            _discard_part_files(output_path)
+            report(0)
+            raise aiohttp.ClientPayloadError(f"Checksum mismatch for {output_path.name}")
+        
+        os.replace(part_path, output_path)
+        state_path.unlink(missing_ok=True)
+    
+    async def _write_body(self, response: aiohttp.ClientResponse, write: Callable[[List[bytes]], Any],
+                          on_written: Callable[[int], None]):
+        """Write a response body to disk without blocking the event loop.
+        
+        Writes run in a worker thread while the next chunks are read off the
+        socket; a bounded queue between the two keeps memory use in check.
+        Chunks that pile up while a write is in flight are handed to write
+        together, so a slow disk costs fewer thread hops and syscalls.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=WRITE_QUEUE_CHUNKS)
+        write_error: Optional[BaseException] = None
+        
+        async def writer():
+            nonlocal write_error
+            done = False
+            while not done:
+                chunks = [await queue.get()]
+                while not queue.empty():
+                    chunks.append(queue.get_nowait())
+                # The end-of-body marker is always the last item queued
+                if chunks[-1] is None:
+                    chunks.pop()
+                    done = True
+                # After a failure keep draining so the reader never blocks on a full queue
+                if write_error is not None or not chunks:
+                    continue
+                try:
+                    await asyncio.to_thread(write, chunks)
+                except Exception as e:
+                    write_error = e
+                else:
+                    on_written(sum(map(len, chunks)))
+        
+        writer_task = asyncio.create_task(writer())
+        try:
+            async for chunk in response.content.iter_chunked(self.config.chunk_size):
+                if write_error is not None:
+                    break
+                await queue.put(chunk)
+        finally:
+            # Always let pending writes finish so nothing touches the file after it closes
+            await queue.put(None)
+            await writer_task
+        
+        if write_error is not None:
+            raise write_error
+    
+    async def _download_ranges(self, url: str, output_path: Path, report: Callable[[int], None]) -> bool:
+        """Download url as ``num_streams`` concurrent byte ranges.
+        
+        Returns False without downloading anything if the server does not
+        support range requests, so the caller can fall back to a single stream.
+        report is called with the number of bytes received so far.
+        
+        Ranges are assembled in a ``.part`` file next to output_path, with the
+        progress of each range kept in a ``.part.json`` sidecar; a failed or
+        interrupted download resumes every range from where it stopped.
+        """
+        part_path, state_path = _part_paths(output_path)
+        
+        # This is only a capability check: a server or CDN that rejects HEAD can
+        # still serve the file over a single stream
+        async with self.session.head(url, allow_redirects=True) as response:
+            if not response.ok:
+                # Falling back would throw away saved ranges, so a transient
+                # failure is retried instead when there is progress to keep
+                if response.status in RETRYABLE_STATUSES and state_path.exists():
+                    response.raise_for_status()
+                return False
+            total_size = int(response.headers.get('content-length', 0))
+            if response.headers.get('accept-ranges', '').lower() != 'bytes' or total_size <= 0:
+                return False
+            expected_md5 = response.headers.get('content-md5')
+            # Identifies the version of the file that a saved .part belongs to
+            version = response.headers.get('etag') or response.headers.get('last-modified')
+        
+        # Each range is [next offset to fetch, last offset]; pick up a previous
+        # attempt's ranges if they were for this same file
+        state = _load_part_state(state_path) if part_path.exists() else None
+        if (state is None or 'ranges' not in state
+                or state.get('size') != total_size or state.get('version') != version):
+            state = None
+        
+        resuming = state is not None
+        if not resuming:
+            part_size = -(-total_size // self.config.num_streams)  # ceiling division
+            state = {
+                'size': total_size,
+                'version': version,
+                'ranges': [[start, min(start + part_size, total_size) - 1]
+                           for start in range(0, total_size, part_size)]
+            }
+        
+        def remaining() -> int:
+            return sum(end + 1 - offset for offset, end in state['ranges'])
+        
+        report(total_size - remaining())
+        
+        async def fetch_range(byte_range: List[int]):
+            start, end = byte_range
+            offset = start
+            async with self.session.get(url, headers={'Range': f'bytes={offset}-{end}'}) as response:
+                response.raise_for_status()
+                if response.status != 206:
+                    raise RangeRequestsUnsupportedError(url)
+                
+                def write_at_offset(chunks: List[bytes]):
+                    nonlocal offset
+                    offset += _write_chunks(fd, chunks, offset)
+                
+                def on_written(size: int):
+                    # Only bytes already written to the file count as fetched
+                    byte_range[0] = offset
+                    report(total_size - remaining())
+                
+                await self._write_body(response, write_at_offset, on_written)
+                if offset != end + 1:
+                    raise aiohttp.ClientPayloadError(f"Incomplete range {start}-{end} for {url}")
+        
+        # Ranges arrive out of order, so they are assembled in the .part file that
+        # only replaces output_path once complete (a partial output_path is
+        # always a valid prefix that a later single-stream attempt can resume)
+        completed = discard = False
+        fd = os.open(part_path, os.O_WRONLY if resuming else os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            if not resuming:
+                # Pre-size the file so every range can be written at its own offset
+                os.ftruncate(fd, total_size)
+            state_path.write_bytes(_dump_json(state))
+            # A TaskGroup cancels the remaining ranges as soon as one fails
+            async with asyncio.TaskGroup() as group:
+                for byte_range in state['ranges']:
+                    if byte_range[0] <= byte_range[1]:
+                        group.create_task(fetch_range(byte_range))
+            # Ranges arrive out of order, so the checksum is taken over the assembled file
+            if expected_md5 and await asyncio.to_thread(_file_content_md5, part_path) != expected_md5.strip():
+                discard = True
+                raise aiohttp.ClientPayloadError(f"Checksum mismatch for {output_path.name}")
+            completed = True
+        except ExceptionGroup as eg:
+            # Surface the underlying error rather than the group wrapper
+            error = eg.exceptions[0]
+            if isinstance(error, RangeRequestsUnsupportedError):
+                discard = True
+                return False
+            raise error
+        finally:
+            os.close(fd)
+            if completed:
+                os.replace(part_path, output_path)
+                state_path.unlink(missing_ok=True)
+            elif discard:
+                _discard_part_files(output_path)
+                report(0)
+            else:
+                # Keep what was fetched so the next attempt only requests the rest
+                state_path.write_bytes(_dump_json(state))
+        
+        return True
     
     async def download_files(self, files: List[Dict[str, Any]], max_concurrent: Optional[int] = None) -> Dict[str, int]:
         """Download multiple files concurrently."""
         if not files:
             return {'success': 0, 'failed': 0}
         
-        max_concurrent = max_concurrent or self.config.max_concurrent_downloads
-        semaphore = asyncio.Semaphore(max_concurrent)
+        if max_concurrent is None:
+            max_concurrent = self.config.max_concurrent_downloads
+        if max_concurrent < 1:
+            raise ValueError(f"max_concurrent must be at least 1, got {max_concurrent}")
+        
+        from rich.progress import (Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn,
+                                   DownloadColumn, TransferSpeedColumn)
         
         results = {'success': 0, 'failed': 0}
         
+        def describe() -> str:
+            return f"Downloading {results['success'] + results['failed']}/{len(files)} files"
+        
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
             BarColumn(),
             TaskProgressColumn(),
+            DownloadColumn(),
+            TransferSpeedColumn(),
             console=console
         ) as progress:
+            # A single task tracks all files, sized from the listing
+            total_size = sum(file_info.get('raw_size', 0) for file_info in files)
+            task_id = progress.add_task(describe(), total=total_size or None)
             
-            async def download_with_progress(file_info):
-                async with semaphore:
-                    task_id = progress.add_task(f"Downloading {file_info['filename']}", total=None)
-                    success = await self.download_file(file_info, progress, task_id)
-                    progress.remove_task(task_id)
-                    return success
+            # A fixed pool of workers takes files from a queue, so only
+            # max_concurrent downloads exist at any time however many files there are
+            queue: asyncio.Queue = asyncio.Queue()
+            for file_info in files:
+                queue.put_nowait(file_info)
             
-            tasks = [download_with_progress(file_info) for file_info in files]
-            download_results = await asyncio.gather(*tasks, return_exceptions=True)
+            async def worker():
+                while not queue.empty():
+                    file_info = queue.get_nowait()
+                    try:
+                        success = await self.download_file(file_info, progress, task_id)
+                    except Exception:
+                        success = False
+                    results['success' if success else 'failed'] += 1
+                    progress.update(task_id, description=describe())
             
-            for result in download_results:
-                if isinstance(result, bool) and result:
-                    results['success'] += 1
-                else:
-                    results['failed'] += 1
+            async with asyncio.TaskGroup() as group:
+                for _ in range(min(max_concurrent, len(files))):
+                    group.create_task(worker())
         
         return results
     
@@ -247,45 +776,95 @@ class ECMWFDownloader:
         if not self.validate_date_format(date):
             raise ValueError(f"Invalid date format: {date}. Expected YYYYMMDD.")
         
-        configurations = {
-            'forecast_times': [],
-            'models': [],
-            'resolutions': [],
-            'data_types': []
-        }
+        forecast_times = set()
         
         # Get forecast times (12z, 18z, etc.)
-        date_url = urljoin(self.config.base_url, f"{date}/")
+        date_url = f"{self.config.base_url}{date}/"
         try:
             async with self.session.get(date_url) as response:
                 if response.status == 200:
-                    content = await response.text()
-                    time_pattern = r'<a href="([^"]+z)/"[^>]*>([^<]+z)/</a>'
-                    time_matches = re.findall(time_pattern, content, re.IGNORECASE)
-                    # Extract just the time part (e.g., "12z" from "/forecasts/20250617/12z")
-                    configurations['forecast_times'] = [match[0].split('/')[-1] for match in time_matches if match[0].endswith('z')]
+                    async for content in self._iter_listing_parts(response):
+                        time_matches = FORECAST_TIME_RE.findall(content)
+                        # Extract just the time part (e.g., "12z" from "/forecasts/20250617/12z")
+                        forecast_times.update(match[0].split('/')[-1] for match in time_matches if match[0].endswith('z'))
         except:
             pass
         
-        # Check common configurations
-        common_configs = [
-            ('12z', 'ifs', ['0p25', '0p4'], ['oper', 'enfo', 'waef', 'wave']),
-            ('18z', 'ifs', ['0p25', '0p4'], ['oper', 'enfo', 'waef', 'wave']),
-            ('18z', 'aifs-single', ['0p25'], ['oper']),
-        ]
+        # Check which known configurations exist, probing their directories in parallel
+        candidates = [(forecast_time, model, resolution, data_type)
+                      for forecast_time in sorted(forecast_times) or DEFAULT_FORECAST_TIMES
+                      for model, (resolutions, data_types) in KNOWN_CONFIGURATIONS.items()
+                      for resolution in resolutions
+                      for data_type in data_types]
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_LISTINGS)
+        
+        async def exists(forecast_time: str, model: str, resolution: str, data_type: str) -> bool:
+            url = f"{self.config.base_url}{date}/{forecast_time}/{model}/{resolution}/{data_type}/"
+            async with semaphore:
+                for attempt in range(self.config.max_retries + 1):
+                    retry_after = None
+                    try:
+                        async with self.session.head(url, allow_redirects=True) as response:
+                            status = response.status
+                            retry_after = response.headers.get('Retry-After')
+                        if status not in (200, 404) and status not in RETRYABLE_STATUSES:
+                            # Some servers reject HEAD; only the status line of a GET is needed
+                            async with self.session.get(url) as response:
+                                status = response.status
+                                retry_after = response.headers.get('Retry-After')
+                        if status not in RETRYABLE_STATUSES:
+                            return status == 200
+                        retryable = True
+                    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                        retryable, _ = _failure_reason(e)
+                    
+                    # A transient failure shouldn't make a configuration look missing
+                    if not retryable or attempt == self.config.max_retries:
+                        return False
+                    await asyncio.sleep(self._retry_delay(attempt, retry_after))
+                return False
         
-        for forecast_time, model, resolutions, data_types in common_configs:
-            if forecast_time in configurations['forecast_times'] or not configurations['forecast_times']:
-                if model not in configurations['models']:
-                    configurations['models'].append(model)
-                for res in resolutions:
-                    if res not in configurations['resolutions']:
-                        configurations['resolutions'].append(res)
-                for dt in data_types:
-                    if dt not in configurations['data_types']:
-                        configurations['data_types'].append(dt)
+        found = await asyncio.gather(*(exists(*candidate) for candidate in candidates))
         
-        return configurations
+        models, resolutions, data_types = set(), set(), set()
+        for (forecast_time, model, resolution, data_type), available in zip(candidates, found):
+            if available:
+                forecast_times.add(forecast_time)
+                models.add(model)
+                resolutions.add(resolution)
+                data_types.add(data_type)
+        
+        return {
+            'forecast_times': sorted(forecast_times),
+            'models': sorted(models),
+            'resolutions': sorted(resolutions),
+            'data_types': sorted(data_types)
+        }
+
+
+def _load_json(raw: bytes) -> Any:
+    """Parse JSON, with orjson when it is installed."""
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def _dump_json(data: Any) -> bytes:
+    """Serialize data as indented JSON, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode()
+
+
+def _run(coro):
+    """Run a command's coroutine, on uvloop when it is installed."""
+    loop_factory = uvloop.new_event_loop if uvloop is not None else None
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        return runner.run(coro)
+
+
+def filter_files(files: List[Dict[str, Any]], regex: re.Pattern) -> List[Dict[str, Any]]:
+    """Keep the files whose name matches regex."""
+    search = regex.search
+    return [f for f in files if search(f['filename'])]
 
 
 def display_files_table(files: List[Dict[str, Any]]):
@@ -294,6 +873,8 @@ def display_files_table(files: List[Dict[str, Any]]):
         console.print("[yellow]No files found.[/yellow]")
         return
     
+    from rich.table import Table
+    
     table = Table(title="Available ECMWF Files")
     table.add_column("Filename", style="cyan", no_wrap=True)
     table.add_column("Type", style="magenta")
@@ -354,7 +935,7 @@ def list_files(
             if files:
                 console.print(f"\n[dim]Found {len(files)} files for {date}/{forecast_time}/{model}/{resolution}/{data_type}[/dim]")
     
-    asyncio.run(_list_files())
+    _run(_list_files())
 
 
 @app.command()
@@ -379,7 +960,7 @@ def list_config(
                     formatted_name = config_type.replace('_', ' ').title()
                     console.print(f"  [dim]{formatted_name}: No data available[/dim]")
     
-    asyncio.run(_list_config())
+    _run(_list_config())
 
 
 @app.command()
@@ -391,7 +972,7 @@ def download(
     data_type: str = typer.Option("oper", "--type", help="Data type (oper, enfo, waef, wave)"),
     pattern: Optional[str] = typer.Option(None, "--pattern", "-p", help="File pattern to match (regex)"),
     output_dir: Optional[Path] = typer.Option(None, "--output", "-o", help="Output directory"),
-    max_concurrent: int = typer.Option(5, "--concurrent", "-c", help="Max concurrent downloads"),
+    max_concurrent: int = typer.Option(5, "--concurrent", "-c", min=1, help="Max concurrent downloads"),
     timeout: int = typer.Option(300, "--timeout", help="Timeout in seconds"),
     dry_run: bool = typer.Option(False, "--dry-run", help="Show what would be downloaded without downloading")
 ):
@@ -400,6 +981,8 @@ def download(
     if output_dir:
         config.output_dir = output_dir
     
+    regex = re.compile(pattern, re.IGNORECASE) if pattern else None
+    
     async def _download():
         async with ECMWFDownloader(config) as downloader:
             console.print(f"[bold]Fetching file list for {date}/{forecast_time}/{model}/{resolution}/{data_type}...[/bold]")
@@ -411,9 +994,8 @@ def download(
                 return
             
             # Filter files by pattern if provided
-            if pattern:
-                regex = re.compile(pattern, re.IGNORECASE)
-                files = [f for f in files if regex.search(f['filename'])]
+            if regex:
+                files = filter_files(files, regex)
                 console.print(f"[dim]Filtered to {len(files)} files matching pattern: {pattern}[/dim]")
             
             if not files:
@@ -439,7 +1021,7 @@ def download(
             if results['failed'] > 0:
                 console.print(f"[red]✗ Failed: {results['failed']} files[/red]")
     
-    asyncio.run(_download())
+    _run(_download())
 
 
 @app.command()
@@ -448,7 +1030,7 @@ def bulk_download(
     end_date: str = typer.Argument(..., help="End date (YYYYMMDD format)"),
     pattern: Optional[str] = typer.Option(None, "--pattern", "-p", help="File pattern to match (regex)"),
     output_dir: Optional[Path] = typer.Option(None, "--output", "-o", help="Output directory"),
-    max_concurrent: int = typer.Option(3, "--concurrent", "-c", help="Max concurrent downloads"),
+    max_concurrent: int = typer.Option(3, "--concurrent", "-c", min=1, help="Max concurrent downloads"),
     dry_run: bool = typer.Option(False, "--dry-run", help="Show what would be downloaded without downloading")
 ):
     """Download ECMWF data for a date range."""
@@ -476,19 +1058,28 @@ def bulk_download(
     
     console.print(f"[bold]Processing {len(date_range)} dates from {start_date} to {end_date}[/bold]")
     
+    regex = re.compile(pattern, re.IGNORECASE) if pattern else None
+    
     async def _bulk_download():
         total_files = 0
         total_success = 0
         total_failed = 0
         
         async with ECMWFDownloader(config) as downloader:
-            for date in date_range:
+            listing_semaphore = asyncio.Semaphore(MAX_CONCURRENT_LISTINGS)
+            
+            async def list_date(date):
+                async with listing_semaphore:
+                    return date, await downloader.list_available_files(date)
+            
+            # List all dates concurrently and handle each one as soon as its listing
+            # arrives, so downloads for early dates overlap the remaining listings
+            for listing in asyncio.as_completed([list_date(date) for date in date_range]):
+                date, files = await listing
                 console.print(f"\n[bold cyan]Processing date: {date}[/bold cyan]")
-                files = await downloader.list_available_files(date)
                 
-                if pattern:
-                    regex = re.compile(pattern, re.IGNORECASE)
-                    files = [f for f in files if regex.search(f['filename'])]
+                if regex:
+                    files = filter_files(files, regex)
                 
                 if not files:
                     console.print(f"[yellow]No files found for {date}[/yellow]")
@@ -516,7 +1107,7 @@ def bulk_download(
         else:
             console.print(f"[yellow]Dry run: Would download {total_files} files[/yellow]")
     
-    asyncio.run(_bulk_download())
+    _run(_bulk_download())
 
 
 @app.command()
@@ -525,29 +1116,24 @@ def config(
     base_url: Optional[str] = typer.Option(None, "--base-url", help="Set base URL"),
     output_dir: Optional[Path] = typer.Option(None, "--output-dir", help="Set default output directory"),
     timeout: Optional[int] = typer.Option(None, "--timeout", help="Set default timeout"),
-    concurrent: Optional[int] = typer.Option(None, "--concurrent", help="Set default concurrent downloads")
+    concurrent: Optional[int] = typer.Option(None, "--concurrent", min=1, help="Set default concurrent downloads")
 ):
     """Configure ECMWF downloader settings."""
     config_file = Path.home() / ".ecmwf_downloader_config.json"
+    # Read the file once for both showing and updating it
+    saved_config = _load_json(config_file.read_bytes()) if config_file.exists() else None
     
     if show:
-        if config_file.exists():
-            import json
-            with open(config_file) as f:
-                config_data = json.load(f)
+        if saved_config is not None:
             console.print("[bold]Current configuration:[/bold]")
-            for key, value in config_data.items():
+            for key, value in saved_config.items():
                 console.print(f"  {key}: {value}")
         else:
             console.print("[yellow]No configuration file found. Using defaults.[/yellow]")
         return
     
     # Update configuration
-    config_data = {}
-    if config_file.exists():
-        import json
-        with open(config_file) as f:
-            config_data = json.load(f)
+    config_data = saved_config or {}
     
     if base_url:
         config_data['base_url'] = base_url
@@ -559,9 +1145,7 @@ def config(
         config_data['max_concurrent_downloads'] = concurrent
     
     if config_data:
-        import json
-        with open(config_file, 'w') as f:
-            json.dump(config_data, f, indent=2)
+        config_file.write_bytes(_dump_json(config_data))
         console.print(f"[green]Configuration saved to {config_file}[/green]")
     else:
         console.print("[yellow]No configuration changes specified.[/yellow]")